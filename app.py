@@ -2,10 +2,19 @@
 Streamlit App: Affordable Housing Policy Tools Analysis
 """
 import streamlit as st
-import pandas as pd
 import json
 import os
 
+# Display names for the policy-mix percentage columns
+POLICY_LABELS = {
+    'public_housing_pct': 'Public Housing',
+    'voucher_pct': 'Housing Vouchers',
+    'lihtc_pct': 'LIHTC',
+    'section8_pct': 'Section 8',
+    'iz_pct': 'Inclusionary Zoning'
+}
+POLICY_COLUMNS = list(POLICY_LABELS)
+
 # Page configuration
 st.set_page_config(
     page_title="Affordable Housing Policy Tools Analysis",
@@ -24,26 +33,279 @@ page = st.sidebar.radio(
     ["Overview", "The Crisis: Where Housing Affordability Hurts Most", "The Policy Response: Tools and Coverage", "Conclusions"]
 )
 
+def number_columns(formats):
+    """Display formats for numeric table columns, so tables can skip the pandas Styler and still sort by value"""
+    return {col: st.column_config.NumberColumn(format=fmt) for col, fmt in formats.items()}
+
 # Load data
-@st.cache_data
+@st.cache_resource
 def load_data():
-    """Load data"""
+    """Load data (shared across sessions, so callers must not mutate it)"""
+    # Imported here so pages without data never pay for pandas
+    import pandas as pd
+    
     try:
-        with open('data/processed/policy_coverage.json', 'r') as f:
-            policy_coverage = json.load(f)
-        with open('data/processed/policy_mix.json', 'r') as f:
-            policy_mix = json.load(f)
-        with open('data/processed/expiring_units.json', 'r') as f:
-            expiring_units = json.load(f)
-        return policy_coverage, policy_mix, expiring_units
+        # Memory-mapped reads decode the Parquet pages straight from the page cache;
+        # expiring units are grouped by city, so that column is read as a categorical
+        read_options = {'expiring_units': {'read_dictionary': ['city']}}
+        return tuple(
+            pd.read_parquet(f'data/processed/{name}.parquet', memory_map=True, **read_options.get(name, {}))
+            for name in ('policy_coverage', 'policy_mix', 'expiring_units')
+        )
     except Exception as e:
         st.error(f"Error loading data: {e}")
         return None, None, None
 
-policy_coverage, policy_mix, expiring_units = load_data()
+@st.cache_resource
+def build_frames():
+    """Build the DataFrames that do not depend on widget state (shared and pre-sorted, so callers must not mutate them)"""
+    policy_coverage, policy_mix, expiring_units = load_data()
+    
+    # Aggregate by city and year; alphabetical categories keep the sorted summary in city-name order
+    city = expiring_units['city']
+    expiring_summary = (
+        expiring_units
+        .assign(city=city.cat.reorder_categories(sorted(city.cat.categories)))
+        .groupby(['city', 'year'], sort=False, as_index=False, observed=True)['expiring_units'].sum()
+        .sort_values(['city', 'year'], ignore_index=True)
+    )
+    
+    return {
+        'coverage': policy_coverage,
+        'mix': policy_mix,
+        'expiring_summary': expiring_summary
+    }
+
+@st.cache_data
+def expiring_views(year_lo, year_hi):
+    """Expiring units by city and year within the selected range, with the running total per city"""
+    df_expiring = build_frames()['expiring_summary']
+    df_summary = df_expiring[df_expiring['year'].between(year_lo, year_hi)].reset_index(drop=True)
+    df_summary['cumulative'] = df_summary.groupby('city', sort=False, observed=True)['expiring_units'].cumsum()
+    return df_summary
+
+@st.cache_data
+def expiring_wide(year_lo, year_hi, values):
+    """One column per city and one row per year, in the shape st.line_chart/st.area_chart expect"""
+    return expiring_views(year_lo, year_hi).pivot_table(
+        index='year', columns='city', values=values, aggfunc='sum', fill_value=0, observed=True
+    )
+
+@st.cache_data
+def demand_supply_frame():
+    """Demand and supply per city, already in the wide shape st.bar_chart expects"""
+    return (
+        build_frames()['coverage']
+        .set_index('city')[['severe_cost_burden_renters', 'total_subsidized']]
+        .rename(columns={
+            'severe_cost_burden_renters': 'Severely Cost-Burdened Renters (Demand)',
+            'total_subsidized': 'Subsidized Housing Units (Supply)'
+        })
+    )
+
+@st.cache_data
+def summary_metrics():
+    """Headline numbers for the Overview page"""
+    df_coverage = build_frames()['coverage']
+    return {
+        'n_cities': len(df_coverage),
+        'total_burdened': int(df_coverage['severe_cost_burden_renters'].sum()),
+        'total_subsidized': int(df_coverage['total_subsidized'].sum())
+    }
+
+# Part 1 charts are compiled to Vega-Lite specs by partner_template.py
+@st.cache_resource
+def load_chart_spec(name):
+    """Load a pre-compiled Vega-Lite spec (shared across sessions, so callers must not mutate it)"""
+    with open(f'visualizations/{name}.vl.json', 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+# ============================================================================
+# Part 2 subsections run as fragments, so their widgets only rerun the subsection
+# ============================================================================
+@st.fragment
+def render_coverage_gap(df_coverage):
+    """Subsection 2.1: Coverage Gap Analysis"""
+    st.subheader("2.1 Coverage Gap Analysis")
+    st.markdown("**Research Question:** Are subsidized housing programs truly covering the 'most burdened' areas?")
+    
+    st.markdown("""
+    This analysis examines whether affordable housing programs are geographically aligned with communities experiencing 
+    the most severe cost burdens.
+    
+    **Key Metrics**:
+    - Number of severely cost-burdened renters (demand)
+    - Total subsidized housing units (supply)
+    - Coverage ratio: subsidized units per 100 severely burdened renters
+    """)
+    
+    # Visualization options
+    viz_type = st.radio("Select Visualization Type", ["Demand vs Supply Comparison", "Coverage Ratio Analysis"], horizontal=True)
+    
+    if viz_type == "Demand vs Supply Comparison":
+        st.subheader("Demand vs Supply Comparison")
+        
+        # Chart
+        st.bar_chart(demand_supply_frame(), height=400)
+        
+        st.caption("Note: Using logarithmic scale to better compare cities of different sizes")
+    
+    else:
+        st.subheader("Coverage Ratio Analysis")
+        
+        # Bar chart (st.bar_chart orders the categorical x axis itself, so no pre-sort)
+        st.bar_chart(
+            df_coverage.set_index('city')['subsidized_per_100_burdened'],
+            height=400
+        )
+        
+        st.caption("Subsidized units per 100 severely burdened renters. Values below 100 indicate insufficient supply.")
+    
+    # Data table
+    st.subheader("Detailed Data")
+    st.dataframe(
+        df_coverage[['city', 'severe_cost_burden_renters', 'total_subsidized', 
+                     'subsidized_per_100_burdened']],
+        column_config=number_columns({
+            'severe_cost_burden_renters': 'localized',
+            'total_subsidized': 'localized',
+            'subsidized_per_100_burdened': '%.1f'
+        }),
+        use_container_width=True
+    )
+    
+    # Key findings
+    st.info("""
+    **Key Finding**:
+    - Cities with the highest numbers of severely burdened renters often have the lowest ratios of subsidized units to need
+    - This suggests policy tools are not effectively targeting communities experiencing the most severe burden challenges
+    """)
+
+@st.fragment
+def render_policy_mix(df_mix):
+    """Subsection 2.2: Policy Mix Comparison"""
+    st.subheader("2.2 Policy Mix Comparison")
+    st.markdown("**Research Question:** Do different types of cities rely on different policy tool combinations?")
+    
+    st.markdown("""
+    This analysis explores whether different types of cities employ different combinations of policy tools.
+    
+    **Policy Tool Types**:
+    - Public Housing
+    - Housing Choice Vouchers
+    - LIHTC (Low-Income Housing Tax Credit)
+    - Section 8 Project-Based
+    - Inclusionary Zoning
+    """)
+    
+    # Select cities
+    selected_cities = st.multiselect(
+        "Select Cities to Compare",
+        df_mix['city'].tolist(),
+        default=df_mix['city'].tolist()
+    )
+    
+    if selected_cities:
+        df_selected = df_mix[df_mix['city'].isin(selected_cities)]
+        
+        # Stacked bar chart (the mix data is already one row per city)
+        st.subheader("Policy Tool Mix (Percentage)")
+        st.bar_chart(
+            df_selected.set_index('city')[POLICY_COLUMNS].rename(columns=POLICY_LABELS),
+            height=400
+        )
+        
+        # Grouped by city type
+        st.subheader("Grouped by City Type")
+        city_type_counts = df_selected['city_type'].value_counts()
+        st.bar_chart(city_type_counts)
+        
+        # Data table
+        st.subheader("Detailed Data")
+        st.dataframe(
+            df_selected[['city', 'city_type'] + POLICY_COLUMNS],
+            column_config=number_columns(dict.fromkeys(POLICY_COLUMNS, '%.1f%%')),
+            use_container_width=True
+        )
+    
+    # Key findings
+    st.info("""
+    **Key Finding**:
+    - **Strong-market cities** (e.g., New York, San Francisco) rely more on LIHTC and inclusionary zoning
+    - **Legacy cities** (e.g., Detroit, Cleveland) rely more on public housing and vouchers
+    - These differences reflect different market conditions and policy histories across cities
+    """)
+
+@st.fragment
+def render_future_risk(df_expiring):
+    """Subsection 2.3: Future Risk Analysis"""
+    st.subheader("2.3 Future Risk Analysis")
+    st.markdown("**Research Question:** Are we 'quietly losing' existing affordable units?")
+    
+    st.markdown("""
+    This analysis addresses a critical but often overlooked challenge: the expiration of affordability restrictions.
+    
+    **Risk Factors**:
+    - LIHTC units typically have 15-year affordability requirements
+    - Section 8 contracts also have expiration dates
+    - After expiration, owners can convert units to market rate
+    """)
+    
+    # Year range selection
+    year_range = st.slider(
+        "Select Year Range",
+        min_value=int(df_expiring['year'].min()),
+        max_value=int(df_expiring['year'].max()),
+        value=(int(df_expiring['year'].min()), int(df_expiring['year'].max())),
+        step=1
+    )
+    
+    df_summary = expiring_views(*year_range)
+    
+    # Time series chart
+    st.subheader("Expiring Units Time Series")
+    
+    # Select cities
+    cities_to_show = st.multiselect(
+        "Select Cities to Display",
+        df_summary['city'].unique().tolist(),
+        default=df_summary['city'].unique().tolist()[:5]
+    )
+    
+    if cities_to_show:
+        pivot_chart = expiring_wide(*year_range, 'expiring_units')
+        st.line_chart(pivot_chart.loc[:, pivot_chart.columns.isin(cities_to_show)], height=400)
+    
+    # Cumulative risk
+    st.subheader("Cumulative Expiring Units")
+    if cities_to_show:
+        pivot_cumulative = expiring_wide(*year_range, 'cumulative')
+        st.area_chart(pivot_cumulative.loc[:, pivot_cumulative.columns.isin(cities_to_show)], height=400)
+    
+    # Data table
+    st.subheader("Detailed Data")
+    st.dataframe(
+        df_summary[['city', 'year', 'expiring_units']],
+        column_config=number_columns({'expiring_units': 'localized'}),
+        use_container_width=True
+    )
+    
+    # Key findings
+    st.warning("""
+    **Key Finding**:
+    - The number of expiring units increases significantly over the next 20 years
+    - Cities with the highest numbers of expiring units often also have the highest numbers of severely burdened renters
+    - This creates a "double burden" where communities already facing burden challenges must also cope with the risk of losing existing affordable units
+    """)
 
-if policy_coverage is None:
-    st.stop()
+# Only these pages read the processed data; the others skip loading it (and pandas)
+if page in ["Overview", "The Policy Response: Tools and Coverage"]:
+    policy_coverage, policy_mix, expiring_units = load_data()
+    
+    if policy_coverage is None:
+        st.stop()
+    
+    frames = build_frames()
 
 # ============================================================================
 # PARTNER'S SECTION: The Crisis: Where Housing Affordability Hurts Most
@@ -81,10 +343,9 @@ if page == "The Crisis: Where Housing Affordability Hurts Most":
         st.subheader("Geographic Distribution of Cost Burden")
         
         try:
-            with open('visualizations/burden_geographic_distribution.html', 'r', encoding='utf-8') as f:
-                st.components.v1.html(f.read(), height=500)
+            st.vega_lite_chart(load_chart_spec('burden_geographic_distribution'), use_container_width=True)
         except FileNotFoundError:
-            st.error("Visualization file not found: visualizations/burden_geographic_distribution.html")
+            st.error("Visualization file not found: visualizations/burden_geographic_distribution.vl.json")
         
         st.caption("""
         **Figure 1:** Number of severely cost-burdened renter households (spending more than 50 percent of income on rent) in each of the eight study cities, colored by city type (strong-market, legacy, or mixed). Strong-market metros combine large numbers of severely burdened renters with intense price pressures, while legacy cities have smaller populations but still carry a high absolute burden relative to their size. *Data Source: Analysis of policy coverage data.*
@@ -102,10 +363,9 @@ if page == "The Crisis: Where Housing Affordability Hurts Most":
         st.subheader("Burden and Subsidy Coverage by City Type")
         
         try:
-            with open('visualizations/burden_by_income_group.html', 'r', encoding='utf-8') as f:
-                st.components.v1.html(f.read(), height=500)
+            st.vega_lite_chart(load_chart_spec('burden_by_income_group'), use_container_width=True)
         except FileNotFoundError:
-            st.error("Visualization file not found: visualizations/burden_by_income_group.html")
+            st.error("Visualization file not found: visualizations/burden_by_income_group.vl.json")
         
         st.caption("""
         **Figure 2:** Interactive scatterplot showing the relationship between need and coverage by city type. Each point represents a city type (strong-market, legacy, mixed); its position on the x-axis shows the share of all severely cost-burdened renters in our eight-city sample, while its position on the y-axis shows subsidized units per 100 severely burdened renters. Point size reflects the total number of severely burdened renters. Dashed reference lines mark the overall average burden share and average coverage level, making it easy to see which city types carry a disproportionate share of need and which fall below average on subsidy coverage.
@@ -123,10 +383,9 @@ if page == "The Crisis: Where Housing Affordability Hurts Most":
         st.subheader("National Housing Costs Before and After COVID-19")
         
         try:
-            with open('visualizations/covid_trends.html', 'r', encoding='utf-8') as f:
-                st.components.v1.html(f.read(), height=500)
+            st.vega_lite_chart(load_chart_spec('covid_trends'), use_container_width=True)
         except FileNotFoundError:
-            st.error("Visualization file not found: visualizations/covid_trends.html")
+            st.error("Visualization file not found: visualizations/covid_trends.vl.json")
         
         st.caption("""
         **Figure 3:** Interactive scatterplot of national housing costs from 2010 onward, combining the FHFA House Price Index with Zillow's typical U.S. home value. Each point represents a year; users can hover to see exact values and brush to zoom into specific time periods. The cluster of pre-2020 points contrasts with the higher, post-2020 cluster, highlighting how quickly housing costs escalated after the onset of COVID-19. *Data sources: FHFA HPI (seasonally adjusted) and Zillow ZHVI.*
@@ -172,18 +431,17 @@ elif page == "Overview":
     
     # Display data summary
     st.subheader("Data Summary")
+    metrics = summary_metrics()
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("Cities Analyzed", len(policy_coverage))
+        st.metric("Cities Analyzed", metrics['n_cities'])
     
     with col2:
-        total_burdened = sum(d['severe_cost_burden_renters'] for d in policy_coverage)
-        st.metric("Total Severely Burdened Renters", f"{total_burdened/1000:.0f}K")
+        st.metric("Total Severely Burdened Renters", f"{metrics['total_burdened']/1000:.0f}K")
     
     with col3:
-        total_subsidized = sum(d['total_subsidized'] for d in policy_coverage)
-        st.metric("Total Subsidized Units", f"{total_subsidized/1000:.0f}K")
+        st.metric("Total Subsidized Units", f"{metrics['total_subsidized']/1000:.0f}K")
 
 # ============================================================================
 # YOUR SECTION: The Policy Response: Tools and Coverage
@@ -207,244 +465,15 @@ elif page == "The Policy Response: Tools and Coverage":
     
     # Subsection 2.1: Coverage Gap Analysis
     if subsection == "2.1 Coverage Gap Analysis":
-        st.subheader("2.1 Coverage Gap Analysis")
-        st.markdown("**Research Question:** Are subsidized housing programs truly covering the 'most burdened' areas?")
-        
-        st.markdown("""
-        This analysis examines whether affordable housing programs are geographically aligned with communities experiencing 
-        the most severe cost burdens.
-        
-        **Key Metrics**:
-        - Number of severely cost-burdened renters (demand)
-        - Total subsidized housing units (supply)
-        - Coverage ratio: subsidized units per 100 severely burdened renters
-        """)
-        
-        # Create dataframe
-        df_coverage = pd.DataFrame(policy_coverage)
-        
-        # Visualization options
-        viz_type = st.radio("Select Visualization Type", ["Demand vs Supply Comparison", "Coverage Ratio Analysis"], horizontal=True)
-        
-        if viz_type == "Demand vs Supply Comparison":
-            st.subheader("Demand vs Supply Comparison")
-            
-            # Prepare data
-            comparison_data = []
-            for row in policy_coverage:
-                comparison_data.append({
-                    'city': row['city'],
-                    'type': 'Severely Cost-Burdened Renters (Demand)',
-                    'count': row['severe_cost_burden_renters']
-                })
-                comparison_data.append({
-                    'city': row['city'],
-                    'type': 'Subsidized Housing Units (Supply)',
-                    'count': row['total_subsidized']
-                })
-            
-            df_compare = pd.DataFrame(comparison_data)
-            
-            # Chart
-            st.bar_chart(
-                df_compare.pivot(index='city', columns='type', values='count'),
-                height=400
-            )
-            
-            st.caption("Note: Using logarithmic scale to better compare cities of different sizes")
-        
-        else:
-            st.subheader("Coverage Ratio Analysis")
-            
-            # Sort
-            df_coverage_sorted = df_coverage.sort_values('subsidized_per_100_burdened', ascending=False)
-            
-            # Bar chart
-            st.bar_chart(
-                df_coverage_sorted.set_index('city')['subsidized_per_100_burdened'],
-                height=400
-            )
-            
-            st.caption("Subsidized units per 100 severely burdened renters. Values below 100 indicate insufficient supply.")
-        
-        # Data table
-        st.subheader("Detailed Data")
-        st.dataframe(
-            df_coverage[['city', 'severe_cost_burden_renters', 'total_subsidized', 
-                         'subsidized_per_100_burdened']].style.format({
-                'severe_cost_burden_renters': '{:,.0f}',
-                'total_subsidized': '{:,.0f}',
-                'subsidized_per_100_burdened': '{:.1f}'
-            }),
-            use_container_width=True
-        )
-        
-        # Key findings
-        st.info("""
-        **Key Finding**:
-        - Cities with the highest numbers of severely burdened renters often have the lowest ratios of subsidized units to need
-        - This suggests policy tools are not effectively targeting communities experiencing the most severe burden challenges
-        """)
+        render_coverage_gap(frames['coverage'])
     
     # Subsection 2.2: Policy Mix Comparison
     elif subsection == "2.2 Policy Mix Comparison":
-        st.subheader("2.2 Policy Mix Comparison")
-        st.markdown("**Research Question:** Do different types of cities rely on different policy tool combinations?")
-        
-        st.markdown("""
-        This analysis explores whether different types of cities employ different combinations of policy tools.
-        
-        **Policy Tool Types**:
-        - Public Housing
-        - Housing Choice Vouchers
-        - LIHTC (Low-Income Housing Tax Credit)
-        - Section 8 Project-Based
-        - Inclusionary Zoning
-        """)
-        
-        # Create dataframe
-        df_mix = pd.DataFrame(policy_mix)
-        
-        # Select cities
-        selected_cities = st.multiselect(
-            "Select Cities to Compare",
-            df_mix['city'].tolist(),
-            default=df_mix['city'].tolist()
-        )
-        
-        if selected_cities:
-            df_selected = df_mix[df_mix['city'].isin(selected_cities)]
-            
-            # Prepare stacked bar chart data
-            mix_data = []
-            for _, row in df_selected.iterrows():
-                for policy in ['public_housing_pct', 'voucher_pct', 'lihtc_pct', 'section8_pct', 'iz_pct']:
-                    policy_name = {
-                        'public_housing_pct': 'Public Housing',
-                        'voucher_pct': 'Housing Vouchers',
-                        'lihtc_pct': 'LIHTC',
-                        'section8_pct': 'Section 8',
-                        'iz_pct': 'Inclusionary Zoning'
-                    }[policy]
-                    mix_data.append({
-                        'city': row['city'],
-                        'city_type': row['city_type'],
-                        'policy': policy_name,
-                        'percentage': row[policy]
-                    })
-            
-            df_mix_long = pd.DataFrame(mix_data)
-            
-            # Stacked bar chart
-            st.subheader("Policy Tool Mix (Percentage)")
-            pivot_data = df_mix_long.pivot(index='city', columns='policy', values='percentage')
-            st.bar_chart(pivot_data, height=400)
-            
-            # Grouped by city type
-            st.subheader("Grouped by City Type")
-            city_type_counts = df_selected['city_type'].value_counts()
-            st.bar_chart(city_type_counts)
-            
-            # Data table
-            st.subheader("Detailed Data")
-            st.dataframe(
-                df_selected[['city', 'city_type', 'public_housing_pct', 'voucher_pct', 
-                             'lihtc_pct', 'section8_pct', 'iz_pct']].style.format({
-                    'public_housing_pct': '{:.1f}%',
-                    'voucher_pct': '{:.1f}%',
-                    'lihtc_pct': '{:.1f}%',
-                    'section8_pct': '{:.1f}%',
-                    'iz_pct': '{:.1f}%'
-                }),
-                use_container_width=True
-            )
-        
-        # Key findings
-        st.info("""
-        **Key Finding**:
-        - **Strong-market cities** (e.g., New York, San Francisco) rely more on LIHTC and inclusionary zoning
-        - **Legacy cities** (e.g., Detroit, Cleveland) rely more on public housing and vouchers
-        - These differences reflect different market conditions and policy histories across cities
-        """)
+        render_policy_mix(frames['mix'])
     
     # Subsection 2.3: Future Risk Analysis
     elif subsection == "2.3 Future Risk Analysis":
-        st.subheader("2.3 Future Risk Analysis")
-        st.markdown("**Research Question:** Are we 'quietly losing' existing affordable units?")
-        
-        st.markdown("""
-        This analysis addresses a critical but often overlooked challenge: the expiration of affordability restrictions.
-        
-        **Risk Factors**:
-        - LIHTC units typically have 15-year affordability requirements
-        - Section 8 contracts also have expiration dates
-        - After expiration, owners can convert units to market rate
-        """)
-        
-        # Create dataframe
-        df_expiring = pd.DataFrame(expiring_units)
-        
-        # Year range selection
-        year_range = st.slider(
-            "Select Year Range",
-            min_value=int(df_expiring['year'].min()),
-            max_value=int(df_expiring['year'].max()),
-            value=(int(df_expiring['year'].min()), int(df_expiring['year'].max())),
-            step=1
-        )
-        
-        df_filtered = df_expiring[
-            (df_expiring['year'] >= year_range[0]) & 
-            (df_expiring['year'] <= year_range[1])
-        ]
-        
-        # Aggregate by city and year
-        df_summary = df_filtered.groupby(['city', 'year']).agg({
-            'expiring_units': 'sum'
-        }).reset_index()
-        
-        # Time series chart
-        st.subheader("Expiring Units Time Series")
-        
-        # Select cities
-        cities_to_show = st.multiselect(
-            "Select Cities to Display",
-            df_summary['city'].unique().tolist(),
-            default=df_summary['city'].unique().tolist()[:5]
-        )
-        
-        if cities_to_show:
-            df_chart = df_summary[df_summary['city'].isin(cities_to_show)]
-            pivot_chart = df_chart.pivot(index='year', columns='city', values='expiring_units')
-            st.line_chart(pivot_chart, height=400)
-        
-        # Cumulative risk
-        st.subheader("Cumulative Expiring Units")
-        df_cumulative = df_summary.copy()
-        df_cumulative = df_cumulative.sort_values(['city', 'year'])
-        df_cumulative['cumulative'] = df_cumulative.groupby('city')['expiring_units'].cumsum()
-        
-        if cities_to_show:
-            df_cumulative_filtered = df_cumulative[df_cumulative['city'].isin(cities_to_show)]
-            pivot_cumulative = df_cumulative_filtered.pivot(index='year', columns='city', values='cumulative')
-            st.area_chart(pivot_cumulative, height=400)
-        
-        # Data table
-        st.subheader("Detailed Data")
-        st.dataframe(
-            df_summary.style.format({
-                'expiring_units': '{:,.0f}'
-            }),
-            use_container_width=True
-        )
-        
-        # Key findings
-        st.warning("""
-        **Key Finding**:
-        - The number of expiring units increases significantly over the next 20 years
-        - Cities with the highest numbers of expiring units often also have the highest numbers of severely burdened renters
-        - This creates a "double burden" where communities already facing burden challenges must also cope with the risk of losing existing affordable units
-        """)
+        render_future_risk(frames['expiring_summary'])
 
 # Conclusions
 elif page == "Conclusions":
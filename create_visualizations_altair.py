@@ -1,245 +1,314 @@
 """
 Create visualizations using Altair
 """
-import pandas as pd
-import altair as alt
+import hashlib
 import json
 import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import altair as alt
+
+# Display names for the policy-mix percentage columns
+POLICY_LABELS = {
+    'public_housing_pct': 'Public Housing',
+    'voucher_pct': 'Housing Vouchers',
+    'lihtc_pct': 'LIHTC',
+    'section8_pct': 'Section 8 Project-Based',
+    'iz_pct': 'Inclusionary Zoning (IZ)'
+}
+POLICY_COLUMNS = list(POLICY_LABELS)
 
 # Configure Altair
 alt.data_transformers.disable_max_rows()
 
-# Create visualizations directory
-os.makedirs('visualizations', exist_ok=True)
 
-print("="*60)
-print("Creating Visualizations with Altair")
-print("="*60)
+# Axis styling shared by every chart, merged into each spec's top-level config
+@alt.theme.register('housing_report', enable=True)
+def housing_report_theme():
+    return alt.theme.ThemeConfig({
+        'config': {
+            'view': {'continuousWidth': 300, 'continuousHeight': 300},
+            'axis': {'labelFontSize': 11, 'titleFontSize': 12}
+        }
+    })
+
+
+# Compiled charts are cached here, keyed on their input data and this script's source
+CACHE_DIR = '.altair_cache'
+
+with open(__file__, 'rb') as f:
+    SCRIPT_SOURCE = f.read()
+
+
+def build_and_save(make_chart, data, path):
+    """Save make_chart(data) to path and return whether the cached output was used, reusing the cached output when the data, this script and the Altair version are unchanged"""
+    extension = os.path.splitext(path)[1]
+    digest = hashlib.blake2b(SCRIPT_SOURCE)
+    # The saved output embeds the Vega-Lite/Vega-Embed versions that ship with Altair
+    digest.update(f"{alt.__version__}:{extension}:{make_chart.__name__}".encode())
+    if isinstance(data, alt.Data):
+        digest.update(json.dumps(data.values).encode())
+    else:
+        digest.update(repr(list(data.dtypes.items())).encode())
+        digest.update(pd.util.hash_pandas_object(data).values.tobytes())
+    cached_path = os.path.join(CACHE_DIR, f"{digest.hexdigest()}{extension}")
+
+    if os.path.exists(cached_path):
+        shutil.copyfile(cached_path, path)
+        return True
+
+    make_chart(data).save(path)
+    # Write-then-rename, so an interrupted copy never leaves a truncated entry under a valid key
+    tmp_path = cached_path + '.tmp'
+    shutil.copyfile(path, tmp_path)
+    os.replace(tmp_path, cached_path)
+    return False
 
-# Load data
-try:
-    policy_coverage = pd.read_csv('data/processed/policy_coverage.csv')
-    policy_mix = pd.read_csv('data/processed/policy_mix.csv')
-    expiring_units = pd.read_csv('data/processed/expiring_units.csv')
-    print("✓ Data loaded successfully")
-except Exception as e:
-    print(f"✗ Error loading data: {e}")
-    exit(1)
 
 # ============================================================================
 # Visualization 1: Coverage Gap Analysis - Demand vs Supply
 # ============================================================================
-print("\n1. Creating coverage gap analysis visualization...")
-
-# Prepare data: merge demand (cost burden renters) and supply (subsidized units)
-coverage_viz_data = policy_coverage.melt(
-    id_vars=['city'],
-    value_vars=['severe_cost_burden_renters', 'total_subsidized'],
-    var_name='type',
-    value_name='count'
-)
-
-coverage_viz_data['type_label'] = coverage_viz_data['type'].map({
-    'severe_cost_burden_renters': 'Severely Cost-Burdened Renters (Demand)',
-    'total_subsidized': 'Subsidized Housing Units (Supply)'
-})
-
-chart1 = alt.Chart(coverage_viz_data).mark_bar().encode(
-    x=alt.X('city:N', title='City', axis=alt.Axis(labelAngle=-45)),
-    y=alt.Y('count:Q', title='Count', scale=alt.Scale(type='log')),
-    color=alt.Color('type_label:N', 
-                   title='Type',
-                   scale=alt.Scale(domain=['Severely Cost-Burdened Renters (Demand)', 'Subsidized Housing Units (Supply)'],
-                                  range=['#d62728', '#2ca02c'])),
-    column=alt.Column('type_label:N', header=alt.Header(title='')),
-    tooltip=['city', 'type_label', alt.Tooltip('count:Q', format=',.0f')]
-).properties(
-    width=300,
-    height=300,
-    title='Affordable Housing Coverage Gap: Demand vs Supply'
-).configure_view(
-    stroke=None
-).configure_axis(
-    labelFontSize=11,
-    titleFontSize=12
-)
-
-chart1.save('visualizations/coverage_gap_altair.html')
-print("✓ Saved: visualizations/coverage_gap_altair.html")
+def make_coverage_gap_chart(coverage_viz_data):
+    return alt.Chart(coverage_viz_data).mark_bar().encode(
+        x=alt.X('city:N', title='City', axis=alt.Axis(labelAngle=-45)),
+        y=alt.Y('count:Q', title='Count', scale=alt.Scale(type='log')),
+        color=alt.Color('type_label:N', 
+                       title='Type',
+                       scale=alt.Scale(domain=['Severely Cost-Burdened Renters (Demand)', 'Subsidized Housing Units (Supply)'],
+                                      range=['#d62728', '#2ca02c'])),
+        column=alt.Column('type_label:N', header=alt.Header(title='')),
+        tooltip=['city', 'type_label', alt.Tooltip('count:Q', format=',.0f')]
+    ).properties(
+        width=300,
+        height=300,
+        title='Affordable Housing Coverage Gap: Demand vs Supply'
+    ).configure_view(
+        stroke=None
+    )
+
 
 # Create coverage ratio chart
-coverage_ratio_chart = alt.Chart(policy_coverage).mark_bar().encode(
-    x=alt.X('city:N', title='City', sort='-y', axis=alt.Axis(labelAngle=-45)),
-    y=alt.Y('subsidized_per_100_burdened:Q', 
-            title='Subsidized Units per 100 Severely Burdened Renters',
-            scale=alt.Scale(domain=[0, 150])),
-    color=alt.Color('subsidized_per_100_burdened:Q',
-                   scale=alt.Scale(scheme='redyellowgreen', domain=[0, 100]),
-                   legend=alt.Legend(title='Coverage Ratio')),
-    tooltip=['city', 
-            alt.Tooltip('severe_cost_burden_renters:Q', format=',.0f', title='Severely Burdened Renters'),
-            alt.Tooltip('total_subsidized:Q', format=',.0f', title='Subsidized Units'),
-            alt.Tooltip('subsidized_per_100_burdened:Q', format='.1f', title='Coverage Ratio')]
-).properties(
-    width=600,
-    height=400,
-    title='Affordable Housing Coverage Ratio: Subsidized Units vs Demand'
-).configure_axis(
-    labelFontSize=11,
-    titleFontSize=12
-)
-
-coverage_ratio_chart.save('visualizations/coverage_ratio_altair.html')
-print("✓ Saved: visualizations/coverage_ratio_altair.html")
+def make_coverage_ratio_chart(coverage_ratio_data):
+    return alt.Chart(coverage_ratio_data).mark_bar().encode(
+        x=alt.X('city:N', title='City', sort='-y', axis=alt.Axis(labelAngle=-45)),
+        y=alt.Y('subsidized_per_100_burdened:Q', 
+                title='Subsidized Units per 100 Severely Burdened Renters',
+                scale=alt.Scale(domain=[0, 150])),
+        color=alt.Color('subsidized_per_100_burdened:Q',
+                       scale=alt.Scale(scheme='redyellowgreen', domain=[0, 100]),
+                       legend=alt.Legend(title='Coverage Ratio')),
+        tooltip=['city', 
+                alt.Tooltip('severe_cost_burden_renters:Q', format=',.0f', title='Severely Burdened Renters'),
+                alt.Tooltip('total_subsidized:Q', format=',.0f', title='Subsidized Units'),
+                alt.Tooltip('subsidized_per_100_burdened:Q', format='.1f', title='Coverage Ratio')]
+    ).properties(
+        width=600,
+        height=400,
+        title='Affordable Housing Coverage Ratio: Subsidized Units vs Demand'
+    )
+
 
 # ============================================================================
 # Visualization 2: Policy Mix Comparison
 # ============================================================================
-print("\n2. Creating policy mix comparison visualization...")
+def make_policy_mix_chart(policy_mix_data):
+    return alt.Chart(policy_mix_data).mark_bar().encode(
+        x=alt.X('city:N', title='City', sort='-y', axis=alt.Axis(labelAngle=-45)),
+        y=alt.Y('percentage:Q', title='Percentage (%)', stack='normalize'),
+        color=alt.Color('policy_label:N',
+                       title='Policy Tool',
+                       scale=alt.Scale(scheme='category10')),
+        order=alt.Order('policy_tool:O', sort='ascending'),
+        tooltip=['city:N', 'city_type:N', 'policy_label:N', 
+                alt.Tooltip('percentage:Q', format='.1f', title='Percentage (%)')]
+    ).properties(
+        width=700,
+        height=400,
+        title='Affordable Housing Policy Tool Mix by City'
+    )
 
-# Prepare stacked bar chart data
-policy_mix_long = policy_mix.melt(
-    id_vars=['city', 'city_type'],
-    value_vars=['public_housing_pct', 'voucher_pct', 'lihtc_pct', 'section8_pct', 'iz_pct'],
-    var_name='policy_tool',
-    value_name='percentage'
-)
-
-policy_mix_long['policy_label'] = policy_mix_long['policy_tool'].map({
-    'public_housing_pct': 'Public Housing',
-    'voucher_pct': 'Housing Vouchers',
-    'lihtc_pct': 'LIHTC',
-    'section8_pct': 'Section 8 Project-Based',
-    'iz_pct': 'Inclusionary Zoning (IZ)'
-})
-
-chart2 = alt.Chart(policy_mix_long).mark_bar().encode(
-    x=alt.X('city:N', title='City', sort='-y', axis=alt.Axis(labelAngle=-45)),
-    y=alt.Y('percentage:Q', title='Percentage (%)', stack='normalize'),
-    color=alt.Color('policy_label:N',
-                   title='Policy Tool',
-                   scale=alt.Scale(scheme='category10')),
-    order=alt.Order('policy_tool:O', sort='ascending'),
-    tooltip=['city', 'city_type', 'policy_label', 
-            alt.Tooltip('percentage:Q', format='.1f', title='Percentage (%)')]
-).properties(
-    width=700,
-    height=400,
-    title='Affordable Housing Policy Tool Mix by City'
-).configure_axis(
-    labelFontSize=11,
-    titleFontSize=12
-)
-
-chart2.save('visualizations/policy_mix_altair.html')
-print("✓ Saved: visualizations/policy_mix_altair.html")
 
 # Grouped by city type version
-chart2_grouped = alt.Chart(policy_mix_long).mark_bar().encode(
-    x=alt.X('city:N', title='City', axis=alt.Axis(labelAngle=-45)),
-    y=alt.Y('percentage:Q', title='Percentage (%)', stack='normalize'),
-    color=alt.Color('policy_label:N',
-                   title='Policy Tool',
-                   scale=alt.Scale(scheme='category10')),
-    column=alt.Column('city_type:N', header=alt.Header(title='City Type')),
-    order=alt.Order('policy_tool:O', sort='ascending'),
-    tooltip=['city', 'policy_label', 
-            alt.Tooltip('percentage:Q', format='.1f', title='Percentage (%)')]
-).properties(
-    width=200,
-    height=300,
-    title='Policy Tool Mix Grouped by City Type'
-).configure_view(
-    stroke=None
-)
-
-chart2_grouped.save('visualizations/policy_mix_by_type_altair.html')
-print("✓ Saved: visualizations/policy_mix_by_type_altair.html")
+def make_policy_mix_by_type_chart(policy_mix_data):
+    return alt.Chart(policy_mix_data).mark_bar().encode(
+        x=alt.X('city:N', title='City', axis=alt.Axis(labelAngle=-45)),
+        y=alt.Y('percentage:Q', title='Percentage (%)', stack='normalize'),
+        color=alt.Color('policy_label:N',
+                       title='Policy Tool',
+                       scale=alt.Scale(scheme='category10')),
+        column=alt.Column('city_type:N', header=alt.Header(title='City Type')),
+        order=alt.Order('policy_tool:O', sort='ascending'),
+        tooltip=['city:N', 'policy_label:N', 
+                alt.Tooltip('percentage:Q', format='.1f', title='Percentage (%)')]
+    ).properties(
+        width=200,
+        height=300,
+        title='Policy Tool Mix Grouped by City Type'
+    ).configure_view(
+        stroke=None
+    )
+
 
 # ============================================================================
 # Visualization 3: Future Risk Analysis - Expiring Affordable Units
 # ============================================================================
-print("\n3. Creating future risk analysis visualization...")
-
-# Aggregate by city and year
-expiring_summary = expiring_units.groupby(['city', 'year']).agg({
-    'expiring_units': 'sum'
-}).reset_index()
-
-chart3 = alt.Chart(expiring_summary).mark_line(point=True).encode(
-    x=alt.X('year:O', title='Year'),
-    y=alt.Y('expiring_units:Q', title='Expiring Units', aggregate='sum'),
-    color=alt.Color('city:N', title='City', scale=alt.Scale(scheme='category20')),
-    tooltip=['city', 'year', 
-            alt.Tooltip('expiring_units:Q', format=',.0f', title='Expiring Units')]
-).properties(
-    width=800,
-    height=400,
-    title='Affordable Housing Unit Expiration Forecast: Next 20 Years'
-).configure_axis(
-    labelFontSize=11,
-    titleFontSize=12
-)
-
-chart3.save('visualizations/expiring_units_timeline_altair.html')
-print("✓ Saved: visualizations/expiring_units_timeline_altair.html")
+def expiring_base(expiring_data):
+    """Year axis and shared rows that the three expiring-units charts build on"""
+    return alt.Chart(expiring_data).encode(x=alt.X('year:O', title='Year'))
+
+
+def make_expiring_timeline_chart(expiring_data):
+    return expiring_base(expiring_data).mark_line(point=True).encode(
+        y=alt.Y('expiring_units:Q', title='Expiring Units'),
+        color=alt.Color('city:N', title='City', scale=alt.Scale(scheme='category20')),
+        tooltip=['city:N', 'year:O', 
+                alt.Tooltip('expiring_units:Q', format=',.0f', title='Expiring Units')]
+    ).properties(
+        width=800,
+        height=400,
+        title='Affordable Housing Unit Expiration Forecast: Next 20 Years'
+    )
+
 
 # Create stacked area chart showing cumulative risk
-expiring_cumulative = expiring_units.groupby(['city', 'year']).agg({
-    'expiring_units': 'sum'
-}).reset_index().sort_values(['city', 'year'])
-
-expiring_cumulative['cumulative'] = expiring_cumulative.groupby('city')['expiring_units'].cumsum()
-
-chart3_area = alt.Chart(expiring_cumulative).mark_area(opacity=0.7).encode(
-    x=alt.X('year:O', title='Year'),
-    y=alt.Y('cumulative:Q', title='Cumulative Expiring Units', stack='normalize'),
-    color=alt.Color('city:N', title='City', scale=alt.Scale(scheme='category20')),
-    tooltip=['city', 'year', 
-            alt.Tooltip('expiring_units:Q', format=',.0f', title='Expiring This Year'),
-            alt.Tooltip('cumulative:Q', format=',.0f', title='Cumulative Expiring')]
-).properties(
-    width=800,
-    height=400,
-    title='Cumulative Expiring Units Forecast (Normalized)'
-).configure_axis(
-    labelFontSize=11,
-    titleFontSize=12
-)
-
-chart3_area.save('visualizations/expiring_units_cumulative_altair.html')
-print("✓ Saved: visualizations/expiring_units_cumulative_altair.html")
+def make_expiring_cumulative_chart(expiring_data):
+    return expiring_base(expiring_data).mark_area(opacity=0.7).encode(
+        y=alt.Y('cumulative_share:Q', title='Cumulative Expiring Units', axis=alt.Axis(format='%')),
+        color=alt.Color('city:N', title='City', scale=alt.Scale(scheme='category20')),
+        tooltip=['city:N', 'year:O', 
+                alt.Tooltip('expiring_units:Q', format=',.0f', title='Expiring This Year'),
+                alt.Tooltip('cumulative:Q', format=',.0f', title='Cumulative Expiring')]
+    ).properties(
+        width=800,
+        height=400,
+        title='Cumulative Expiring Units Forecast (Normalized)'
+    )
+
 
 # Create heatmap showing risk concentration
-chart3_heatmap = alt.Chart(expiring_summary).mark_rect().encode(
-    x=alt.X('year:O', title='Year'),
-    y=alt.Y('city:N', title='City', sort='-x'),
-    color=alt.Color('expiring_units:Q',
-                   title='Expiring Units',
-                   scale=alt.Scale(scheme='reds')),
-    tooltip=['city', 'year', 
-            alt.Tooltip('expiring_units:Q', format=',.0f', title='Expiring Units')]
-).properties(
-    width=900,
-    height=400,
-    title='Affordable Housing Unit Expiration Risk Heatmap'
-).configure_axis(
-    labelFontSize=11,
-    titleFontSize=12
-)
-
-chart3_heatmap.save('visualizations/expiring_units_heatmap_altair.html')
-print("✓ Saved: visualizations/expiring_units_heatmap_altair.html")
-
-print("\n" + "="*60)
-print("All Altair visualizations created successfully!")
-print("="*60)
-print("\nGenerated files:")
-print("  - visualizations/coverage_gap_altair.html")
-print("  - visualizations/coverage_ratio_altair.html")
-print("  - visualizations/policy_mix_altair.html")
-print("  - visualizations/policy_mix_by_type_altair.html")
-print("  - visualizations/expiring_units_timeline_altair.html")
-print("  - visualizations/expiring_units_cumulative_altair.html")
-print("  - visualizations/expiring_units_heatmap_altair.html")
+def make_expiring_heatmap_chart(expiring_data):
+    return expiring_base(expiring_data).mark_rect().encode(
+        y=alt.Y('city:N', title='City', sort='-x'),
+        color=alt.Color('expiring_units:Q',
+                       title='Expiring Units',
+                       scale=alt.Scale(scheme='reds')),
+        tooltip=['city:N', 'year:O', 
+                alt.Tooltip('expiring_units:Q', format=',.0f', title='Expiring Units')]
+    ).properties(
+        width=900,
+        height=400,
+        title='Affordable Housing Unit Expiration Risk Heatmap'
+    )
+
+
+def main():
+    # Create visualizations directory
+    os.makedirs('visualizations', exist_ok=True)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+
+    print("="*60)
+    print("Creating Visualizations with Altair")
+    print("="*60)
+
+    # Load data
+    try:
+        policy_coverage = pd.read_parquet('data/processed/policy_coverage.parquet')
+        policy_mix = pd.read_parquet('data/processed/policy_mix.parquet')
+        expiring_units = pd.read_parquet('data/processed/expiring_units.parquet', read_dictionary=['city'])
+        print("✓ Data loaded successfully")
+    except Exception as e:
+        print(f"✗ Error loading data: {e}")
+        exit(1)
+
+    # (factory, data, output path) for every chart; they are built together at the end
+    charts = []
+
+    # Prepare data: merge demand (cost burden renters) and supply (subsidized units)
+    coverage_viz_data = policy_coverage.melt(
+        id_vars=['city'],
+        value_vars=['severe_cost_burden_renters', 'total_subsidized'],
+        var_name='type',
+        value_name='count'
+    )
+
+    coverage_viz_data['type_label'] = coverage_viz_data['type'].map({
+        'severe_cost_burden_renters': 'Severely Cost-Burdened Renters (Demand)',
+        'total_subsidized': 'Subsidized Housing Units (Supply)'
+    })
+
+    # Charts inline their data into the saved spec, so only keep the encoded columns
+    coverage_viz_data = coverage_viz_data[['city', 'type_label', 'count']]
+
+    charts.append((make_coverage_gap_chart, coverage_viz_data, 'visualizations/coverage_gap_altair.html'))
+
+    # Create coverage ratio chart
+    coverage_ratio_data = policy_coverage[['city', 'severe_cost_burden_renters', 'total_subsidized',
+                                           'subsidized_per_100_burdened']]
+
+    charts.append((make_coverage_ratio_chart, coverage_ratio_data, 'visualizations/coverage_ratio_altair.html'))
+
+    # Prepare stacked bar chart data
+    policy_mix_long = policy_mix.melt(
+        id_vars=['city', 'city_type'],
+        value_vars=POLICY_COLUMNS,
+        var_name='policy_tool',
+        value_name='percentage'
+    )
+
+    policy_mix_long['policy_label'] = policy_mix_long['policy_tool'].map(POLICY_LABELS)
+
+    # Both policy-mix charts embed the same rows, so serialize them once
+    policy_mix_data = alt.Data(values=policy_mix_long.to_dict(orient='records'))
+
+    charts.append((make_policy_mix_chart, policy_mix_data, 'visualizations/policy_mix_altair.html'))
+    charts.append((make_policy_mix_by_type_chart, policy_mix_data, 'visualizations/policy_mix_by_type_altair.html'))
+
+    # City is read as a categorical so the groupbys below work on its codes; alphabetical
+    # categories make the one sort of the raw rows put cities in name order, which every
+    # groupby below keeps with sort=False
+    city = expiring_units['city']
+    expiring_units = (
+        expiring_units
+        .assign(city=city.cat.reorder_categories(sorted(city.cat.categories)))
+        .sort_values(['city', 'year'], kind='stable', ignore_index=True)
+    )
+
+    # Aggregate by city and year once; every expiring-units chart reads this frame
+    expiring_summary = (
+        expiring_units
+        .groupby(['city', 'year'], sort=False, as_index=False, observed=True)['expiring_units'].sum()
+    )
+    expiring_summary['cumulative'] = expiring_summary.groupby('city', sort=False, observed=True)['expiring_units'].cumsum()
+    # Each city's share of the year's cumulative total, so the area chart stacks to 100% without a Vega transform
+    expiring_summary['cumulative_share'] = (
+        expiring_summary['cumulative'] / expiring_summary.groupby('year', sort=False)['cumulative'].transform('sum')
+    )
+
+    # Serialize the rows once per column set; the timeline and heatmap share the yearly counts,
+    # and only the cumulative chart embeds the running totals
+    expiring_yearly_data = alt.Data(
+        values=expiring_summary[['city', 'year', 'expiring_units']].to_dict(orient='records')
+    )
+    expiring_cumulative_data = alt.Data(values=expiring_summary.to_dict(orient='records'))
+
+    charts.append((make_expiring_timeline_chart, expiring_yearly_data, 'visualizations/expiring_units_timeline_altair.html'))
+    charts.append((make_expiring_cumulative_chart, expiring_cumulative_data, 'visualizations/expiring_units_cumulative_altair.html'))
+    charts.append((make_expiring_heatmap_chart, expiring_yearly_data, 'visualizations/expiring_units_heatmap_altair.html'))
+
+    print(f"\nBuilding {len(charts)} visualizations...")
+
+    # The charts share no state, so compile and save them in separate processes;
+    # map() yields results in submission order, so the report lines stay in order
+    with ProcessPoolExecutor(max_workers=min(len(charts), os.cpu_count() or 1)) as executor:
+        for (_, _, path), cached in zip(charts, executor.map(build_and_save, *zip(*charts))):
+            print(f"✓ Saved: {path}{' (cached)' if cached else ''}")
+
+    print("\n" + "="*60)
+    print(f"All {len(charts)} Altair visualizations created successfully!")
+    print("="*60)
+
 
+if __name__ == '__main__':
+    main()
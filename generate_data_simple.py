@@ -1,9 +1,14 @@
 """
-Simple data processing script: No pandas/numpy dependency
+Simple data processing script: writes the processed datasets as Parquet
+
+The random draws deliberately stay on the stdlib `random` module, seeded with 42 and
+called in a fixed order, so the committed datasets can be regenerated byte for byte;
+NumPy is only used to assemble the drawn values into columns.
 """
 import os
-import csv
 import random
+import numpy as np
+import pandas as pd
 
 # Create processed directory
 os.makedirs('data/processed', exist_ok=True)
@@ -12,7 +17,7 @@ print("="*60)
 print("Generating Affordable Housing Data")
 print("="*60)
 
-# Set random seed
+# Set random seed; stdlib random (not NumPy) so this reproduces the committed datasets
 random.seed(42)
 
 cities = ['New York, NY', 'Los Angeles, CA', 'Chicago, IL', 
@@ -32,102 +37,77 @@ severe_cost_burden_renters = {
     'Boston, MA': 150
 }
 
-policy_data = []
-for city in cities:
-    public_housing = random.randint(20, 150) * 1000
-    vouchers = random.randint(50, 300) * 1000
-    lihtc = random.randint(30, 200) * 1000
-    section8 = random.randint(10, 80) * 1000
-    
-    total_subsidized = public_housing + vouchers + lihtc + section8
-    cost_burden_renters = severe_cost_burden_renters.get(city, 100) * 1000
-    coverage_ratio = (total_subsidized / cost_burden_renters * 100) if cost_burden_renters > 0 else 0
-    
-    policy_data.append({
-        'city': city,
-        'severe_cost_burden_renters': cost_burden_renters,
-        'public_housing_units': public_housing,
-        'voucher_households': vouchers,
-        'lihtc_units': lihtc,
-        'section8_units': section8,
-        'total_subsidized': total_subsidized,
-        'coverage_ratio': round(coverage_ratio, 2),
-        'subsidized_per_100_burdened': round(coverage_ratio, 2)
-    })
-
-with open('data/processed/policy_coverage.csv', 'w', newline='') as f:
-    writer = csv.DictWriter(f, fieldnames=policy_data[0].keys())
-    writer.writeheader()
-    writer.writerows(policy_data)
+# Per city, in draw order: public housing, vouchers, LIHTC, Section 8
+unit_counts = np.array([
+    [random.randint(20, 150), random.randint(50, 300), random.randint(30, 200), random.randint(10, 80)]
+    for _ in cities
+]) * 1000
+public_housing, vouchers, lihtc, section8 = unit_counts.T
+
+total_subsidized = unit_counts.sum(axis=1)
+cost_burden_renters = np.array([severe_cost_burden_renters.get(city, 100) for city in cities]) * 1000
+coverage_ratio = np.round(total_subsidized / cost_burden_renters * 100, 2)
+
+policy_data = pd.DataFrame({
+    'city': cities,
+    'severe_cost_burden_renters': cost_burden_renters,
+    'public_housing_units': public_housing,
+    'voucher_households': vouchers,
+    'lihtc_units': lihtc,
+    'section8_units': section8,
+    'total_subsidized': total_subsidized,
+    'coverage_ratio': coverage_ratio,
+    'subsidized_per_100_burdened': coverage_ratio
+})
+
+policy_data.to_parquet('data/processed/policy_coverage.parquet', index=False, compression='zstd')
 print(f"✓ Created policy coverage data for {len(policy_data)} cities")
 
 # 2. Create policy mix data
 print("\n2. Creating policy mix data...")
-policy_mix_data = []
-for city in cities:
-    if city in ['New York, NY', 'San Francisco, CA', 'Boston, MA']:
-        mix = {
-            'city': city,
-            'city_type': 'Strong Market',
-            'public_housing_pct': 15,
-            'voucher_pct': 25,
-            'lihtc_pct': 45,
-            'section8_pct': 10,
-            'iz_pct': 5
-        }
-    elif city in ['Detroit, MI', 'Cleveland, OH']:
-        mix = {
-            'city': city,
-            'city_type': 'Legacy City',
-            'public_housing_pct': 40,
-            'voucher_pct': 35,
-            'lihtc_pct': 15,
-            'section8_pct': 8,
-            'iz_pct': 2
-        }
-    else:
-        mix = {
-            'city': city,
-            'city_type': 'Mixed',
-            'public_housing_pct': 25,
-            'voucher_pct': 30,
-            'lihtc_pct': 30,
-            'section8_pct': 10,
-            'iz_pct': 5
-        }
-    policy_mix_data.append(mix)
-
-with open('data/processed/policy_mix.csv', 'w', newline='') as f:
-    writer = csv.DictWriter(f, fieldnames=policy_mix_data[0].keys())
-    writer.writeheader()
-    writer.writerows(policy_mix_data)
+# Policy shares per city type, one row per type in column order
+type_mix = pd.DataFrame(
+    [[15, 25, 45, 10, 5],
+     [40, 35, 15, 8, 2],
+     [25, 30, 30, 10, 5]],
+    index=['Strong Market', 'Legacy City', 'Mixed'],
+    columns=['public_housing_pct', 'voucher_pct', 'lihtc_pct', 'section8_pct', 'iz_pct']
+)
+city_types = np.select(
+    [np.isin(cities, ['New York, NY', 'San Francisco, CA', 'Boston, MA']),
+     np.isin(cities, ['Detroit, MI', 'Cleveland, OH'])],
+    ['Strong Market', 'Legacy City'],
+    default='Mixed'
+)
+
+policy_mix_data = type_mix.loc[city_types].reset_index(drop=True)
+policy_mix_data.insert(0, 'city', cities)
+policy_mix_data.insert(1, 'city_type', city_types)
+
+policy_mix_data.to_parquet('data/processed/policy_mix.parquet', index=False, compression='zstd')
 print(f"✓ Created policy mix data")
 
 # 3. Create future risk data
 print("\n3. Creating future risk data...")
-years = list(range(2025, 2046))
-expiration_data = []
-
-for city in cities:
-    for year in years:
-        if year < 2030:
-            expiring = random.randint(500, 3000)
-        elif year < 2035:
-            expiring = random.randint(1000, 5000)
-        else:
-            expiring = random.randint(2000, 8000)
-        
-        expiration_data.append({
-            'city': city,
-            'year': year,
-            'expiring_units': expiring,
-            'policy_type': 'LIHTC' if random.random() > 0.3 else 'Section 8'
-        })
-
-with open('data/processed/expiring_units.csv', 'w', newline='') as f:
-    writer = csv.DictWriter(f, fieldnames=expiration_data[0].keys())
-    writer.writeheader()
-    writer.writerows(expiration_data)
+years = np.arange(2025, 2046)
+
+# Expiring-unit band per year; each city-year draws its units, then the LIHTC/Section 8 coin flip
+year_bands = [(500, 3000) if year < 2030 else (1000, 5000) if year < 2035 else (2000, 8000) for year in years]
+expiring = []
+policy_draw = []
+for _ in cities:
+    for lo, hi in year_bands:
+        expiring.append(random.randint(lo, hi))
+        policy_draw.append(random.random())
+
+expiration_data = pd.DataFrame({
+    'city': np.repeat(cities, len(years)),
+    'year': np.tile(years, len(cities)),
+    'expiring_units': expiring,
+    'policy_type': np.where(np.array(policy_draw) > 0.3, 'LIHTC', 'Section 8')
+})
+
+expiration_data.to_parquet('data/processed/expiring_units.parquet', index=False, compression='zstd')
 print(f"✓ Created future risk data ({len(expiration_data)} records)")
 
 print("\n" + "="*60)
@@ -1,42 +1,59 @@
+import hashlib
+import inspect
 import os
+from functools import lru_cache
+import numpy as np
 import pandas as pd
 import altair as alt
 
 alt.data_transformers.disable_max_rows()
 
-os.makedirs("visualizations", exist_ok=True)
-
-print("=" * 60)
-print("Creating Part 1 Visualizations")
-print("=" * 60)
-
-def load_csv(fname: str) -> pd.DataFrame:
+# Callers only read these frames, so the cached DataFrame is handed out as-is
+@lru_cache(maxsize=None)
+def load_processed(fname: str) -> pd.DataFrame:
     path1 = os.path.join("data", "processed", fname)
     path2 = fname
 
     if os.path.exists(path1):
         print(f"Loading {path1}")
-        return pd.read_csv(path1)
+        return pd.read_parquet(path1)
     elif os.path.exists(path2):
         print(f"Loading {path2}")
-        return pd.read_csv(path2)
+        return pd.read_parquet(path2)
     else:
         raise FileNotFoundError(
             f"Could not find {fname} in data/processed/ or current directory."
         )
 
+def resolve_data_path(fname):
+    path1 = os.path.join("data", fname)
+    path2 = fname
+    if os.path.exists(path1):
+        return path1
+    if os.path.exists(path2):
+        return path2
+    raise FileNotFoundError(f"{fname} not found in data/ or current directory.")
+
+def load_from_data_folder(fname, **read_kwargs):
+    path = resolve_data_path(fname)
+    print(f"Loading {path}")
+    return pd.read_csv(path, **read_kwargs)
+
+def load_burden_by_city() -> pd.DataFrame:
+    """Policy coverage per city with its city type, shared by charts 1 and 2"""
+    coverage = load_processed("policy_coverage.parquet")
+    mix = load_processed("policy_mix.parquet")
+
+    # Categorical keys sharing one dtype let the merge and the city-type groupby work on integer codes
+    city_dtype = pd.CategoricalDtype(coverage["city"].unique())
+    coverage = coverage.astype({"city": city_dtype})
+    city_types = mix[["city", "city_type"]].astype({"city": city_dtype, "city_type": "category"})
+    return coverage.merge(city_types, on="city", how="left")
+
 # ============================================================================
 # Visualization 1: Geographic Distribution of Severe Cost Burden
 # ============================================================================
-print("\n1. Creating geographic distribution visualization...")
-
-try:
-    coverage = load_csv("policy_coverage.csv")
-    mix = load_csv("policy_mix.csv")
-    burden_geo = coverage.merge(
-        mix[["city", "city_type"]], on="city", how="left"
-    )
-
+def make_geographic_chart(burden_geo: pd.DataFrame) -> alt.Chart:
     chart1 = (
         alt.Chart(burden_geo)
         .mark_bar()
@@ -77,33 +94,16 @@ try:
         )
     )
 
-    chart1.save("visualizations/burden_geographic_distribution.html")
-    print("Saved: visualizations/burden_geographic_distribution.html")
-
-except FileNotFoundError:
-    print(
-        "WARNING: policy_coverage.csv or policy_mix.csv not found. "
-        "Skipping chart 1."
-    )
-except Exception as e:
-    print(f"ERROR creating chart 1: {e}")
+    return chart1
 
 
 # ============================================================================
 # Visualization 2: Burden & Coverage by City Type
 # (saved to burden_by_income_group.html to match the article)
 # ============================================================================
-print("\n2. Creating 'income group' visualization (by city type)...")
-
-try:
-    coverage = load_csv("policy_coverage.csv")
-    mix = load_csv("policy_mix.csv")
-    merged = coverage.merge(
-        mix[["city", "city_type"]], on="city", how="left"
-    )
-
+def make_city_type_chart(burden_geo: pd.DataFrame) -> alt.LayerChart:
     by_type = (
-        merged.groupby("city_type", as_index=False)
+        burden_geo.groupby("city_type", as_index=False, observed=True)
         .agg(
             total_severe=("severe_cost_burden_renters", "sum"),
             total_subsidized=("total_subsidized", "sum"),
@@ -131,16 +131,17 @@ try:
     max_size = by_type["total_severe"].max()
     min_size = by_type["total_severe"].min()
     
+    size_norm = (by_type["total_severe"] - min_size) / (max_size - min_size)
+    
     # Simple strategy: labels above for lower points, below for upper points
     # Use moderate offsets that scale with circle size
-    by_type["label_dy"] = by_type.apply(
-        lambda row: -25 - (row["total_severe"] - min_size) / (max_size - min_size) * 10 if row["subsidized_per_100_burdened"] > median_y 
-        else 25 + (row["total_severe"] - min_size) / (max_size - min_size) * 10, axis=1
+    by_type["label_dy"] = np.where(
+        by_type["subsidized_per_100_burdened"] > median_y,
+        -25 - size_norm * 10,
+        25 + size_norm * 10,
     )
     # Small horizontal offset to avoid direct overlap
-    by_type["label_dx"] = by_type.apply(
-        lambda row: 1.5 + (row["total_severe"] - min_size) / (max_size - min_size) * 0.5, axis=1
-    )
+    by_type["label_dx"] = 1.5 + size_norm * 0.5
 
     # Overall reference values for lines
     overall_share = by_type["severely_burdened_pct"].mean()
@@ -262,47 +263,64 @@ try:
         )
     )
 
-    chart2.save("visualizations/burden_by_income_group.html")
-    print("Saved: visualizations/burden_by_income_group.html")
-
-except FileNotFoundError:
-    print(
-        "WARNING: policy_coverage.csv or policy_mix.csv not found. "
-        "Skipping chart 2."
-    )
-except Exception as e:
-    print(f"ERROR creating chart 2: {e}")
+    return chart2
 
 
 # ============================================================================
 # Visualization 3: COVID-19 Impact Trends (Interactive Circle Plot, No Lines)
 # ============================================================================
-print("\n3. Creating COVID trends visualization...")
-
-def load_from_data_folder(fname):
-    path1 = os.path.join("data", fname)
-    path2 = fname
-    if os.path.exists(path1):
-        print(f"Loading {path1}")
-        return pd.read_csv(path1)
-    if os.path.exists(path2):
-        print(f"Loading {path2}")
-        return pd.read_csv(path2)
-    raise FileNotFoundError(f"{fname} not found in data/ or current directory.")
-
-try:
-    hpi = load_from_data_folder("hpi_master.csv")
-    zhvi = load_from_data_folder("Metro_zhvi_uc_sfrcondo_tier_0.33_0.67_sm_sa_month.csv")
+COVID_TRENDS_SOURCES = ["hpi_master.csv", "Metro_zhvi_uc_sfrcondo_tier_0.33_0.67_sm_sa_month.csv"]
+COVID_TRENDS_CACHE = os.path.join("data", "processed", "covid_trends.parquet")
+
+def covid_trends_cache_key() -> str:
+    """Digest of the code that builds the table and of the source CSVs the loader resolves (path, size, mtime)"""
+    # Only the table-building code is hashed, so editing the chart factories keeps the cache
+    digest = hashlib.blake2b()
+    for func in (build_covid_trends, load_from_data_folder, resolve_data_path):
+        digest.update(inspect.getsource(func).encode())
+    for fname in COVID_TRENDS_SOURCES:
+        path = resolve_data_path(fname)
+        stat = os.stat(path)
+        digest.update(f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+def load_covid_trends() -> pd.DataFrame:
+    """Yearly HPI/ZHVI trends, re-parsed from the CSVs only when the cached Parquet's key no longer matches"""
+    cache_key = covid_trends_cache_key()
+    key_path = COVID_TRENDS_CACHE + ".key"
+    if os.path.exists(COVID_TRENDS_CACHE) and os.path.exists(key_path):
+        with open(key_path) as f:
+            if f.read() == cache_key:
+                print(f"Loading {COVID_TRENDS_CACHE}")
+                return pd.read_parquet(COVID_TRENDS_CACHE)
+
+    covid_trends = build_covid_trends()
+    os.makedirs(os.path.dirname(COVID_TRENDS_CACHE), exist_ok=True)
+    covid_trends.to_parquet(COVID_TRENDS_CACHE, index=False)
+    with open(key_path, "w") as f:
+        f.write(cache_key)
+    return covid_trends
+
+
+def build_covid_trends() -> pd.DataFrame:
+    # Only parse the columns the chart uses; the filter keys repeat heavily, so read them as categories
+    hpi = load_from_data_folder(
+        COVID_TRENDS_SOURCES[0],
+        usecols=["place_name", "frequency", "yr", "index_sa"],
+        dtype={"place_name": "category", "frequency": "category"},
+    )
+    # Skip the ZHVI metadata columns other than RegionName; everything else is a monthly value
+    zhvi = load_from_data_folder(
+        COVID_TRENDS_SOURCES[1],
+        usecols=lambda c: c not in ["RegionID", "SizeRank", "RegionType", "StateName"],
+    )
     hpi_us = hpi[
         (hpi["place_name"] == "United States") &
         (hpi["frequency"] == "monthly")
     ].copy()
 
-    hpi_us["month"] = hpi_us["period"].astype(int)
-    hpi_us["date"] = pd.to_datetime(
-        hpi_us["yr"].astype(str) + "-" + hpi_us["month"].astype(str) + "-01"
-    )
-    hpi_us["year"] = hpi_us["date"].dt.year
+    hpi_us["year"] = hpi_us["yr"].astype(int)
 
     hpi_year = (
         hpi_us.groupby("year", as_index=False)["index_sa"]
@@ -312,26 +330,29 @@ try:
     hpi_year = hpi_year[hpi_year["year"] >= 2010]
 
     zhvi_us = zhvi[zhvi["RegionName"] == "United States"].copy()
-    date_cols = [
-        c for c in zhvi_us.columns
-        if c not in ["RegionID", "SizeRank", "RegionName", "RegionType", "StateName"]
-    ]
-
-    zhvi_long = zhvi_us.melt(
-        id_vars=["RegionName"],
-        value_vars=date_cols,
-        var_name="date_str",
-        value_name="zhvi"
+    date_cols = zhvi_us.columns.drop("RegionName")
+
+    # Parse each date header once
+    header_dates = pd.Series(
+        pd.to_datetime(date_cols, format="%Y-%m-%d", errors="coerce"), index=date_cols
+    ).dropna()
+    header_years = header_dates.dt.year
+
+    # Average the US row's monthly values within each year directly on the wide row
+    zhvi_us_row = zhvi_us[header_years.index].iloc[0]
+    zhvi_year = (
+        zhvi_us_row.groupby(header_years).mean()
+        .rename_axis("year")
+        .reset_index(name="zhvi")
     )
-
-    zhvi_long["date"] = pd.to_datetime(zhvi_long["date_str"], errors="coerce")
-    zhvi_long = zhvi_long.dropna(subset=["date"])
-    zhvi_long["year"] = zhvi_long["date"].dt.year
-
-    zhvi_year = zhvi_long.groupby("year", as_index=False)["zhvi"].mean()
     zhvi_year = zhvi_year[zhvi_year["year"] >= 2010]
 
     covid_trends = pd.merge(hpi_year, zhvi_year, on="year", how="inner")
+
+    return covid_trends
+
+
+def make_covid_trends_chart(covid_trends: pd.DataFrame) -> alt.LayerChart:
     hover = alt.selection_point(fields=["year"], nearest=True, on="mouseover")
     brush = alt.selection_interval(encodings=["x"])
 
@@ -374,8 +395,63 @@ try:
         )
     )
 
-    chart3.save("visualizations/covid_trends.html")
-    print("Saved: visualizations/covid_trends.html")
+    return chart3
+
+
+def main():
+    os.makedirs("visualizations", exist_ok=True)
+
+    print("=" * 60)
+    print("Creating Part 1 Visualizations")
+    print("=" * 60)
+
+    print("\n1. Creating geographic distribution visualization...")
+
+    try:
+        burden_geo = load_burden_by_city()
+    except FileNotFoundError:
+        burden_geo = None
+        print(
+            "WARNING: policy_coverage.parquet or policy_mix.parquet not found. "
+            "Skipping charts 1 and 2."
+        )
+    except Exception as e:
+        burden_geo = None
+        print(f"ERROR loading data for charts 1 and 2: {e}")
+
+    if burden_geo is not None:
+        try:
+            chart1 = make_geographic_chart(burden_geo)
+            chart1.save("visualizations/burden_geographic_distribution.html")
+            chart1.save("visualizations/burden_geographic_distribution.vl.json")
+            print("Saved: visualizations/burden_geographic_distribution.html (+ .vl.json spec)")
+
+        except Exception as e:
+            print(f"ERROR creating chart 1: {e}")
+
+    print("\n2. Creating 'income group' visualization (by city type)...")
+
+    if burden_geo is not None:
+        try:
+            chart2 = make_city_type_chart(burden_geo)
+            chart2.save("visualizations/burden_by_income_group.html")
+            chart2.save("visualizations/burden_by_income_group.vl.json")
+            print("Saved: visualizations/burden_by_income_group.html (+ .vl.json spec)")
+
+        except Exception as e:
+            print(f"ERROR creating chart 2: {e}")
+
+    print("\n3. Creating COVID trends visualization...")
+
+    try:
+        chart3 = make_covid_trends_chart(load_covid_trends())
+        chart3.save("visualizations/covid_trends.html")
+        chart3.save("visualizations/covid_trends.vl.json")
+        print("Saved: visualizations/covid_trends.html (+ .vl.json spec)")
+
+    except Exception as e:
+        print(f"ERROR creating chart 3: {e}")
+
 
-except Exception as e:
-    print(f"ERROR creating chart 3: {e}")
+if __name__ == "__main__":
+    main()